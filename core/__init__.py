@@ -1,6 +1,13 @@
 # core/__init__.py
 from .config import ConfigManager
 from .audio import list_input_devices
-from .recognizer import WhisperRecognizer
 
 __all__ = ["ConfigManager", "list_input_devices", "WhisperRecognizer"]
+
+
+def __getattr__(name):
+    # recognizer тянет torch/whisper — импортируем только по первому обращению
+    if name == "WhisperRecognizer":
+        from .recognizer import WhisperRecognizer
+        return WhisperRecognizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import List, Optional, Tuple, Callable
 import numpy as np
 import sounddevice as sd
-from scipy.signal import wiener
+from numba import njit
 
 
 def list_input_devices() -> List[dict]:
@@ -11,12 +11,17 @@ def list_input_devices() -> List[dict]:
     try:
         for idx, dev in enumerate(sd.query_devices()):
             if dev.get("max_input_channels", 0) > 0:
+                name = dev.get("name", f"Device {idx}")
+                sr = dev.get("default_samplerate")
+                ch = dev.get("max_input_channels")
                 out.append({
                     "index": idx,
-                    "name": dev.get("name", f"Device {idx}"),
+                    "name": name,
                     "hostapi": dev.get("hostapi"),
-                    "sr": dev.get("default_samplerate"),
-                    "channels": dev.get("max_input_channels"),
+                    "sr": sr,
+                    "channels": ch,
+                    # готовая подпись для списков в GUI
+                    "_display": f"[{idx}] {name}  (ch={ch}, sr={int(sr or 0)})",
                 })
     except Exception:
         pass
@@ -29,28 +34,89 @@ def open_input_stream(
     device_index: Optional[int],
     blocksize: int,
     channels: int = 1,
+    dtype: str = "int16",
 ):
-    """Фабрика безопасного ввода."""
+    """Фабрика безопасного ввода (по умолчанию int16 — вдвое меньше трафика, чем float32)."""
     return sd.InputStream(
         device=device_index,
         samplerate=samplerate,
         channels=channels,
-        dtype="float32",
+        dtype=dtype,
         blocksize=blocksize,
         callback=callback,
     )
 
 
-def apply_gain(x: np.ndarray, gain_db: float) -> np.ndarray:
-    if not gain_db:
-        return x
-    g = 10.0 ** (float(gain_db) / 20.0)
-    return np.clip(x * g, -1.0, 1.0).astype(np.float32)
+def db_to_gain(gain_db: float) -> float:
+    return 10.0 ** (float(gain_db) / 20.0)
+
+
+@njit(cache=True, fastmath=True)
+def _gain_clip_inplace(x, g):
+    for i in range(x.shape[0]):
+        v = x[i] * g
+        if v > 1.0:
+            v = 1.0
+        elif v < -1.0:
+            v = -1.0
+        x[i] = v
+
+
+def apply_gain_inplace(x: np.ndarray, gain_lin: float) -> None:
+    """Усиление + ограничение [-1, 1] за один проход, на месте (1D float32).
+
+    Ограничение нужно при любом gain_lin != 1: вход не обязан быть в [-1, 1]
+    (VAD передаёт значения int16 с множителем gain/32768).
+    """
+    if gain_lin != 1.0:
+        _gain_clip_inplace(x, gain_lin)
+
+
+@njit(cache=True, fastmath=True)
+def _wiener_1d(x, mysize, out):
+    """Винеровский фильтр (как scipy.signal.wiener для 1D, нулевые края).
+
+    Скользящие сумма и сумма квадратов по окну mysize: проход 1 считает
+    шум (среднюю локальную дисперсию), проход 2 пишет оценку в out.
+    """
+    n = x.shape[0]
+    half = mysize // 2
+    inv = 1.0 / mysize
+    noise = 0.0
+    for stage in range(2):
+        s = 0.0
+        s2 = 0.0
+        for j in range(min(half + 1, n)):
+            v = x[j]
+            s += v
+            s2 += v * v
+        for i in range(n):
+            mu = s * inv
+            var = s2 * inv - mu * mu
+            if stage == 0:
+                noise += var
+            elif var < noise:
+                out[i] = mu
+            else:
+                out[i] = mu + (1.0 - noise / var) * (x[i] - mu)
+            j = i + half + 1
+            if j < n:
+                v = x[j]
+                s += v
+                s2 += v * v
+            j = i - half
+            if j >= 0:
+                v = x[j]
+                s -= v
+                s2 -= v * v
+        if stage == 0:
+            noise /= n
 
 
 def denoise_wiener(x: np.ndarray, mysize: int = 29) -> np.ndarray:
     try:
-        y = wiener(x, mysize=mysize)
-        return np.clip(y, -1.0, 1.0).astype(np.float32)
+        out = np.empty(x.shape[0], dtype=np.float32)
+        _wiener_1d(x, mysize, out)
+        return np.clip(out, -1.0, 1.0, out=out)
     except Exception:
         return x
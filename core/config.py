@@ -4,6 +4,11 @@ import json
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # необязательная зависимость — есть запасной путь через json
+    orjson = None
+
 class ConfigManager:
     DEFAULTS: Dict[str, Any] = {
         "device_index": None,        # int | None
@@ -14,18 +19,25 @@ class ConfigManager:
         "lang_mode": "standard",     # standard | priority | exclusive
         "chosen_lang": "ru",         # ru | en | zh
         "ui_language": "ru",         # ru | en | zh  <-- добавлено
+        "beam_size": 1,              # 1 = жадный поиск; 5 — качество офлайн
+        "best_of": 1,                # >1 — запасной проход сэмплированием
+        "silence_gate": 0.01,        # RMS реплики ниже порога — не распознаём
+        "cpu_threads": None,         # int | None (авто: min(ядра, 4))
+        "adaptive_length": False,    # окно энкодера по длине реплики вместо 30 с
     }
 
     def __init__(self, path: Optional[Path] = None) -> None:
         base = Path(__file__).resolve().parents[1]
         self.path = path or (base / "config.json")
         self.data: Dict[str, Any] = {}
+        self._dirty = False
         self.load()
 
     def load(self) -> None:
         if self.path.exists():
             try:
-                self.data = json.loads(self.path.read_text(encoding="utf-8"))
+                raw = self.path.read_bytes()
+                self.data = orjson.loads(raw) if orjson else json.loads(raw.decode("utf-8"))
             except Exception:
                 self.data = {}
         for k, v in self.DEFAULTS.items():
@@ -34,30 +46,40 @@ class ConfigManager:
 
     def save(self) -> None:
         try:
-            self.path.write_text(json.dumps(self.data, ensure_ascii=False, indent=2), encoding="utf-8")
+            if orjson:
+                raw = orjson.dumps(self.data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                raw = json.dumps(self.data, ensure_ascii=False, indent=2).encode("utf-8")
+            self.path.write_bytes(raw)
+            self._dirty = False
         except Exception:
             pass
 
+    def flush(self) -> None:
+        """Записать на диск, только если сеттеры что-то поменяли."""
+        if self._dirty:
+            self.save()
+
     # properties
     @property
     def device_index(self): return self.data.get("device_index")
     @device_index.setter
-    def device_index(self, v): self.data["device_index"] = v; self.save()
+    def device_index(self, v): self.data["device_index"] = v; self._dirty = True
 
     @property
     def gain_db(self) -> float: return float(self.data.get("gain_db", 0.0))
     @gain_db.setter
-    def gain_db(self, v: float): self.data["gain_db"] = float(v); self.save()
+    def gain_db(self, v: float): self.data["gain_db"] = float(v); self._dirty = True
 
     @property
     def noise_reduction(self) -> bool: return bool(self.data.get("noise_reduction", True))
     @noise_reduction.setter
-    def noise_reduction(self, v: bool): self.data["noise_reduction"] = bool(v); self.save()
+    def noise_reduction(self, v: bool): self.data["noise_reduction"] = bool(v); self._dirty = True
 
     @property
     def model_name(self) -> str: return str(self.data.get("model_name", "small"))
     @model_name.setter
-    def model_name(self, v: str): self.data["model_name"] = str(v); self.save()
+    def model_name(self, v: str): self.data["model_name"] = str(v); self._dirty = True
 
     @property
     def sample_rate(self) -> int: return int(self.data.get("sample_rate", 16000))
@@ -65,14 +87,31 @@ class ConfigManager:
     @property
     def lang_mode(self) -> str: return str(self.data.get("lang_mode", "standard"))
     @lang_mode.setter
-    def lang_mode(self, v: str): self.data["lang_mode"] = v; self.save()
+    def lang_mode(self, v: str): self.data["lang_mode"] = v; self._dirty = True
 
     @property
     def chosen_lang(self) -> str: return str(self.data.get("chosen_lang", "ru"))
     @chosen_lang.setter
-    def chosen_lang(self, v: str): self.data["chosen_lang"] = v; self.save()
+    def chosen_lang(self, v: str): self.data["chosen_lang"] = v; self._dirty = True
 
     @property
     def ui_language(self) -> str: return str(self.data.get("ui_language", "ru"))
     @ui_language.setter
-    def ui_language(self, v: str): self.data["ui_language"] = v; self.save()
+    def ui_language(self, v: str): self.data["ui_language"] = v; self._dirty = True
+
+    @property
+    def beam_size(self) -> int: return max(1, int(self.data.get("beam_size", 1)))
+
+    @property
+    def best_of(self) -> int: return max(1, int(self.data.get("best_of", 1)))
+
+    @property
+    def silence_gate(self) -> float: return float(self.data.get("silence_gate", 0.01))
+
+    @property
+    def cpu_threads(self) -> Optional[int]:
+        v = self.data.get("cpu_threads")
+        return max(1, int(v)) if v else None
+
+    @property
+    def adaptive_length(self) -> bool: return bool(self.data.get("adaptive_length", False))
@@ -1,22 +1,37 @@
-# core/log_utils.py
 from __future__ import annotations
 from datetime import datetime
 from pathlib import Path
+from typing import Optional, TextIO
 
 class LogFile:
     def __init__(self, base_dir: Path) -> None:
         base_dir.mkdir(parents=True, exist_ok=True)
         ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         self.path = base_dir / f"log_{ts}.txt"
+        # файл открыт на всё время сессии; построчная буферизация — хвост виден сразу
+        self._fh: Optional[TextIO] = None
+        try:
+            self._fh = open(self.path, "a", encoding="utf-8", buffering=1)
+        except Exception:
+            pass
         self._write(f"===== Sanyou AI log {ts} =====")
 
     def write(self, line: str) -> None:
         self._write(line)
 
+    def close(self) -> None:
+        fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except Exception:
+                pass
+
     def _write(self, line: str) -> None:
+        if self._fh is None:
+            return
         try:
             ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.path, "a", encoding="utf-8") as fh:
-                fh.write(f"[{ts}] {line}\n")
+            self._fh.write(f"[{ts}] {line}\n")
         except Exception:
-            pass
+            pass  # в т.ч. ValueError, если файл уже закрыт
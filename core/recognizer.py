@@ -3,8 +3,10 @@ from __future__ import annotations
 
 import os
 import gc
-import queue
+import atexit
+import dataclasses
 import threading
+from fractions import Fraction
 from pathlib import Path
 from typing import Callable, Optional, Dict, Tuple
 
@@ -14,27 +16,184 @@ os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
 
 import numpy as np
 import torch
+import torch.nn.functional as F
 import whisper
+from whisper.decoding import DecodingTask
+from scipy.signal import firwin, resample_poly
 
 from .config import ConfigManager
 from .log_utils import LogFile
-from .audio import list_input_devices, open_input_stream, apply_gain, denoise_wiener
+from .audio import list_input_devices, open_input_stream, apply_gain_inplace, db_to_gain, denoise_wiener
 from .vad import EnergyVAD
 
 
-# ограничим потоки BLAS
+# слоты кольцевого буфера кадров микрофона (при заполнении кадры отбрасываются)
+_RING_SLOTS = 12
+
+# пороги отбраковки гипотез (значения по умолчанию whisper.transcribe)
+_NO_SPEECH_TH = 0.3
+_LOGPROB_MIN = -1.0
+_COMPRESSION_MAX = 2.4
+_FALLBACK_T = 0.2
+
+# языки, между которыми выбирает распознаватель (порядок = позиции в _allowed_lang_probs)
+_ALLOWED_LANGS: Tuple[str, ...] = ("ru", "en", "zh")
+
 try:
-    torch.set_num_threads(max(1, min(os.cpu_count() or 2, 4)))
+    torch.set_num_interop_threads(1)
 except Exception:
     pass
 
 
+def _quantize_int8(model: "whisper.Whisper") -> "whisper.Whisper":
+    """Динамическая int8-квантизация Linear-слоёв (CPU). Без int8-движка — исходная модель."""
+    engines = torch.backends.quantized.supported_engines
+    engine = "fbgemm" if "fbgemm" in engines else ("qnnpack" if "qnnpack" in engines else None)
+    if engine is None:
+        return model
+    torch.backends.quantized.engine = engine
+    model = model.eval()
+    # whisper.model.Linear — подкласс nn.Linear (лишь приводит dtype весов);
+    # quantize_dynamic сопоставляет типы точно, поэтому приводим к базовому классу
+    for m in model.modules():
+        if isinstance(m, torch.nn.Linear) and type(m) is not torch.nn.Linear:
+            m.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _trace_encoder(model: "whisper.Whisper") -> None:
+    """Заменяет энкодер на torch.jit-трассу (вход всегда 30 с → форма фиксирована)."""
+    example = torch.zeros(1, model.dims.n_mels, 2 * model.dims.n_audio_ctx)
+    encoder = model.encoder
+    with torch.inference_mode():
+        model.encoder = torch.jit.trace(encoder, example, strict=False, check_trace=False)
+    # eager-энкодер нужен для окон короче 30 с (adaptive_length); не регистрируем как подмодуль
+    object.__setattr__(model, "_eager_encoder", encoder)
+
+
+# загруженные (и квантизованные) модели по имени — общие для всех распознавателей
+_MODEL_CACHE: Dict[str, whisper.Whisper] = {}
+# _MODEL_LOCK — только поиск/вставка в кэш; загрузка идёт под замком своего имени,
+# чтобы tiny (тест языка) не ждала загрузки основной модели
+_MODEL_LOCK = threading.Lock()
+_LOAD_LOCKS: Dict[str, threading.Lock] = {}
+
+
+def _read_model(name: str) -> "whisper.Whisper":
+    """Как whisper.load_model(), но чекпойнт читается через mmap и weights_only.
+
+    Опирается на приватные whisper._MODELS/_download/_ALIGNMENT_HEADS;
+    если их нет (другая версия whisper) — обычный whisper.load_model().
+    """
+    models = getattr(whisper, "_MODELS", None)
+    download = getattr(whisper, "_download", None)
+    heads = getattr(whisper, "_ALIGNMENT_HEADS", None)
+    if not models or download is None or heads is None or name not in models:
+        return whisper.load_model(name, device="cpu")
+    root = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "whisper")
+    try:
+        path = download(models[name], root, False)
+        ckpt = torch.load(path, map_location="cpu", weights_only=True, mmap=True)
+        model = whisper.Whisper(whisper.ModelDimensions(**ckpt["dims"]))
+        # assign=True — параметры становятся тензорами из mmap, веса подгружаются страницами по мере надобности
+        model.load_state_dict(ckpt["model_state_dict"], assign=True)
+        model.set_alignment_heads(heads[name])
+    except Exception:
+        # старый (не zip) формат чекпойнта mmap не поддерживает; иные сбои — тоже штатный загрузчик
+        return whisper.load_model(name, device="cpu", download_root=root)
+    return model
+
+
+def _get_model(name: str, on_warn: Optional[Callable[[str], None]] = None) -> "whisper.Whisper":
+    with _MODEL_LOCK:
+        model = _MODEL_CACHE.get(name)
+        if model is not None:
+            return model
+        load_lock = _LOAD_LOCKS.setdefault(name, threading.Lock())
+    with load_lock:
+        # пока ждали замок, модель мог загрузить другой поток
+        with _MODEL_LOCK:
+            model = _MODEL_CACHE.get(name)
+        if model is not None:
+            return model
+        model = _read_model(name)
+        try:
+            model = _quantize_int8(model)
+        except Exception as e:
+            if on_warn:
+                on_warn(f"[WARN] int8 quantization skipped: {e}")
+        encoder = model.encoder
+        try:
+            _trace_encoder(model)
+        except Exception as e:
+            model.encoder = encoder  # остаёмся в eager-режиме
+            if on_warn:
+                on_warn(f"[WARN] encoder tracing skipped: {e}")
+        with _MODEL_LOCK:
+            _MODEL_CACHE[name] = model
+        return model
+
+
+def _drop_model(name: str) -> None:
+    with _MODEL_LOCK:
+        _MODEL_CACHE.pop(name, None)
+
+
+def _embed_audio(model: "whisper.Whisper", audio: np.ndarray) -> torch.Tensor:
+    """log-Mel + энкодер за один раз; признаки идут в _allowed_lang_probs и _EncodedDecodingTask.
+
+    Аудио короче 30 с кодируется окном своей длины (срез позиционных эмбеддингов).
+    """
+    mel = whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels).unsqueeze(0)
+    with torch.inference_mode():
+        if mel.shape[-1] == 2 * model.dims.n_audio_ctx:
+            return model.embed_audio(mel)
+        enc = getattr(model, "_eager_encoder", model.encoder)
+        x = F.gelu(enc.conv1(mel))
+        x = F.gelu(enc.conv2(x))
+        x = x.permute(0, 2, 1)
+        x = (x + enc.positional_embedding[: x.shape[1]]).to(x.dtype)
+        for block in enc.blocks:
+            x = block(x)
+        return enc.ln_post(x)
+
+
+def _lang_table(model: "whisper.Whisper") -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """(sot, id токенов всех языков, позиции _ALLOWED_LANGS среди них) — считается раз на модель."""
+    table = getattr(model, "_lang_table", None)
+    if table is None:
+        tok = whisper.tokenizer.get_tokenizer(model.is_multilingual, num_languages=model.num_languages)
+        codes = list(tok.all_language_codes)
+        table = (
+            torch.tensor([[tok.sot]]),
+            torch.tensor(tok.all_language_tokens),
+            torch.tensor([codes.index(c) for c in _ALLOWED_LANGS]),
+        )
+        object.__setattr__(model, "_lang_table", table)
+    return table
+
+
+def _allowed_lang_probs(model: "whisper.Whisper", feats: torch.Tensor) -> torch.Tensor:
+    """Как whisper.detect_language по готовым признакам: softmax по всем языкам, затем только _ALLOWED_LANGS."""
+    sot, lang_ids, allowed_pos = _lang_table(model)
+    with torch.inference_mode():
+        logits = model.logits(sot, feats)[0, 0]
+        return logits[lang_ids].softmax(dim=-1)[allowed_pos]
+
+
+class _EncodedDecodingTask(DecodingTask):
+    """DecodingTask по готовым признакам энкодера (без проверки формы 30-секундного окна)."""
+
+    def _get_audio_features(self, mel: torch.Tensor) -> torch.Tensor:
+        return mel
+
+
 class WhisperRecognizer:
     """
     Непрерывное офлайн-распознавание (Whisper) для {ru,en,zh}.
     Оптимизации:
       • модель грузится в фоновом потоке (статус 'loading');
-      • очереди ограничены (без утечки RAM);
+      • кадры идут через кольцевой буфер без блокировок и аллокаций;
       • VAD/NR/усиление — на лету;
       • режимы стандарт/приоритет/исключительный;
       • аккуратная остановка потоков.
@@ -59,12 +218,23 @@ class WhisperRecognizer:
         self.on_status = on_status or (lambda s: None)
 
         self.cfg = config or ConfigManager()
+        atexit.register(self.cfg.flush)
+        # число потоков по умолчанию задаёт main.py (OMP_NUM_THREADS до всех импортов)
+        threads = self.cfg.cpu_threads or int(os.environ.get("OMP_NUM_THREADS") or 0)
+        if threads:
+            try:
+                torch.set_num_threads(threads)
+            except Exception:
+                pass
         self.sr = int(self.cfg.sample_rate)
         self.frame = int(self.sr * frame_ms / 1000.0)
+        # линейное усиление считаем при смене настроек; применяет его VAD к готовой реплике
+        self._gain_lin = db_to_gain(self.cfg.gain_db)
 
         base = Path(__file__).resolve().parents[1]
         logs_dir = base / "logs"
         self.log = LogFile(logs_dir)
+        atexit.register(self.log.close)
         self.log_path = self.log.path
 
         self._emit_info(f"[INFO] PyTorch {torch.__version__} | CUDA: {torch.cuda.is_available()}")
@@ -75,29 +245,44 @@ class WhisperRecognizer:
         self._loading = False
 
         # рабочие объекты
-        self._audio_q: "queue.Queue[np.ndarray]" = queue.Queue(maxsize=12)
+        # SPSC-кольцо: пишет только аудио-колбэк (_w), читает только _process_loop (_r)
+        self._ring = np.empty((_RING_SLOTS, self.frame), dtype=np.int16)
+        self._w = 0
+        self._r = 0
+        self._have_data = threading.Event()
         self._stream_thread: Optional[threading.Thread] = None
         self._proc_thread: Optional[threading.Thread] = None
+        # у каждого запуска свой stop-event: потоки прошлого запуска, не успевшие
+        # завершиться за таймаут stop(), не оживают при следующем start()
         self._stop_evt = threading.Event()
 
         # vad
-        self.vad = EnergyVAD(sr=self.sr)
+        self.vad = EnergyVAD(sr=self.sr, gain=self._gain_lin)
+        # статистика реплик: всего / отброшено как тишина
+        self._utt_total = 0
+        self._utt_silent = 0
 
         # состояния
         self.is_running = False
         self.is_paused = False
 
         # языки
-        self._allowed = {"ru", "en", "zh"}
         self._last_lang: Optional[str] = None
 
+        # FIR-фильтры ресемплера по исходной частоте: sr -> (up, down, h)
+        self._fir_cache: Dict[int, Tuple[int, int, np.ndarray]] = {}
+
+        # компиляция numba-ядер — в фоне, чтобы не попасть на первый «Старт»
+        threading.Thread(target=self._warm_jits, daemon=True).start()
+
     # ---------- публичный API ----------
     def start(self) -> None:
         if self.is_running:
             return
         self.is_running = True
         self.is_paused = False
-        self._stop_evt.clear()
+        stop_evt = self._stop_evt = threading.Event()
+        prev_stream, prev_proc = self._stream_thread, self._proc_thread
 
         if self.model is None and not self._loading:
             self._loading = True
@@ -106,11 +291,11 @@ class WhisperRecognizer:
             t.start()
 
         # поток чтения микрофона
-        self._stream_thread = threading.Thread(target=self._mic_loop, daemon=True)
+        self._stream_thread = threading.Thread(target=self._mic_loop, args=(stop_evt, prev_stream), daemon=True)
         self._stream_thread.start()
 
         # поток обработки
-        self._proc_thread = threading.Thread(target=self._process_loop, daemon=True)
+        self._proc_thread = threading.Thread(target=self._process_loop, args=(stop_evt, prev_proc), daemon=True)
         self._proc_thread.start()
 
     def pause(self) -> None:
@@ -136,12 +321,7 @@ class WhisperRecognizer:
         self.is_running = False
         self.is_paused = False
         self._stop_evt.set()
-        # освободим очередь
-        try:
-            while not self._audio_q.empty():
-                self._audio_q.get_nowait()
-        except Exception:
-            pass
+        self._have_data.set()
         # дождёмся
         for th in (self._stream_thread, self._proc_thread):
             try:
@@ -149,6 +329,11 @@ class WhisperRecognizer:
                     th.join(timeout=1.5)
             except Exception:
                 pass
+        if self._utt_total:
+            self._emit_info(
+                f"[INFO] Utterances: {self._utt_total}, skipped as silence: {self._utt_silent} "
+                f"({100.0 * self._utt_silent / self._utt_total:.0f}%)"
+            )
         self._emit_status("stopped")
         self._emit_info("🛑 Остановлено")
 
@@ -164,6 +349,8 @@ class WhisperRecognizer:
         # микрофон / обработка
         self.cfg.device_index = device_index
         self.cfg.gain_db = gain_db
+        self._gain_lin = db_to_gain(self.cfg.gain_db)
+        self.vad.gain = self._gain_lin
         self.cfg.noise_reduction = noise_reduction
         # языки
         if lang_mode is not None:
@@ -177,35 +364,41 @@ class WhisperRecognizer:
             # освобождаем старую модель и принудительно перезагрузим на старте
             try:
                 self.model = None
+                _drop_model(old)
                 gc.collect()
             except Exception:
                 pass
             self._emit_info(f"[INFO] Модель изменена: {old} → {self.cfg.model_name}. Будет загружена при запуске.")
+        self.cfg.flush()
 
     # для теста в настройках
     def detect_language_from_audio(self, audio: np.ndarray, sr: int) -> Tuple[str, float]:
         x = self._resample_if_needed(audio, sr)
-        x = whisper.pad_or_trim(x.astype(np.float32))
+        x = whisper.pad_or_trim(x)  # _resample_if_needed уже вернул float32
         if self.cfg.noise_reduction:
             x = denoise_wiener(x)
-        mel = whisper.log_mel_spectrogram(x)
-        if self.model is None:
-            # временную модель загрузим синхронно (малую) только для детектора языка
-            tmp_model = whisper.load_model("tiny", device="cpu")
-            _, probs = tmp_model.detect_language(mel)
-        else:
-            _, probs = self.model.detect_language(mel)
-        filt = {k: v for k, v in probs.items() if k in self._allowed}
-        if not filt:
-            return ("en", 0.0)
-        lang = max(filt, key=filt.get)
-        return (lang, float(filt[lang]))
+        model = self.model or _MODEL_CACHE.get(self.cfg.model_name)
+        if model is None:
+            # основная ещё не загружена — малая модель (грузится один раз, из кэша)
+            model = _get_model("tiny")
+            if self.model is not None:
+                # основная успела загрузиться (и уже выгрузила tiny из кэша) — tiny не держим
+                if self.cfg.model_name != "tiny":
+                    _drop_model("tiny")
+                model = self.model
+        probs = _allowed_lang_probs(model, _embed_audio(model, x))
+        i = int(probs.argmax())
+        return (_ALLOWED_LANGS[i], float(probs[i]))
 
     # ---------- внутреннее ----------
     def _load_model_bg(self):
         try:
             self._emit_info(f"[INFO] Loading Whisper model '{self.cfg.model_name}'...")
-            self.model = whisper.load_model(self.cfg.model_name, device="cpu")
+            model = _get_model(self.cfg.model_name, self._emit_info)
+            _lang_table(model)  # таблица LID — заранее, не на первой реплике
+            self.model = model
+            if self.cfg.model_name != "tiny":
+                _drop_model("tiny")  # основная модель теперь отвечает и за тест языка
             if not self.is_paused and self.is_running:
                 self._emit_status("running")
             self._emit_info("[INFO] Model ready.")
@@ -214,21 +407,40 @@ class WhisperRecognizer:
         finally:
             self._loading = False
 
-    def _mic_loop(self):
-        """Чтение аудио → очередь."""
+    def _warm_jits(self):
+        try:
+            # слабый шум, а не нули: на нулях _wiener_1d делит на нулевую дисперсию и уходит в fallback
+            dummy = np.random.default_rng(0).standard_normal(64).astype(np.float32) * 1e-3
+            apply_gain_inplace(dummy, 2.0)  # любой gain != 1 компилирует _gain_clip_inplace
+            denoise_wiener(dummy)
+            EnergyVAD(sr=self.sr).feed(np.zeros(32, dtype=np.int16))
+            self._emit_info("[INFO] JIT warm-up done")
+        except Exception as e:
+            self._emit_info(f"[WARN] JIT warm-up failed: {e}")
+
+    def _mic_loop(self, stop_evt: threading.Event, prev: Optional[threading.Thread] = None):
+        """Чтение аудио → кольцевой буфер."""
+        # писатель кольца всегда один: ждём, пока поток прошлого запуска закроет свой поток ввода
+        if prev is not None and prev is not threading.current_thread():
+            prev.join()
+
         def _cb(indata, frames, time_info, status):
-            if self._stop_evt.is_set():
+            if stop_evt.is_set():
                 return
             if status:
                 self._emit_info(f"[AUDIO] {status}")
             if not self.is_running or self.is_paused:
                 return
-            x = indata.reshape(-1).astype(np.float32)
-            x = apply_gain(x, self.cfg.gain_db)
-            try:
-                self._audio_q.put_nowait(x)
-            except queue.Full:
-                pass
+            w = self._w
+            if w - self._r >= _RING_SLOTS:
+                return  # обработка не успевает — кадр отбрасываем
+            if frames != self.frame:
+                return  # поток открыт с blocksize=self.frame; иное — не наш блок
+            slot = self._ring[w % _RING_SLOTS]
+            # indata[:, 0] — view без копии; единственная копия — в слот кольца
+            np.copyto(slot, indata[:, 0])
+            self._w = w + 1
+            self._have_data.set()
 
         try:
             stream = open_input_stream(
@@ -239,56 +451,82 @@ class WhisperRecognizer:
                 channels=1,
             )
             with stream:
-                while self.is_running and not self._stop_evt.is_set():
+                while not stop_evt.is_set():
                     import time
                     time.sleep(0.05)
         except Exception as e:
             self._emit_info(f"[ERROR] Audio stream: {e}")
-            self.stop()
-
-    def _process_loop(self):
+            if not stop_evt.is_set():
+                self.stop()
+
+    def _process_loop(self, stop_evt: threading.Event, prev: Optional[threading.Thread] = None):
+        # читатель кольца тоже один: прошлый цикл мог застрять в долгом декодировании
+        if prev is not None:
+            prev.join()
+        # непрочитанные кадры прошлого запуска отбрасываем — сдвигает _r только читатель
+        self._r = self._w
         self.vad.reset()
-        while self.is_running and not self._stop_evt.is_set():
-            try:
-                x = self._audio_q.get(timeout=0.3)
-            except queue.Empty:
+        while not stop_evt.is_set():
+            if self._r == self._w:
+                self._have_data.clear()
+                if self._r == self._w:  # повторная проверка после clear()
+                    self._have_data.wait(timeout=0.3)
                 continue
 
             if self.is_paused:
+                self._r += 1
                 self.vad.reset()
                 continue
 
-            utt = self.vad.feed(x)
+            # VAD копирует кадр к себе, после чего слот можно освобождать
+            utt = self.vad.feed(self._ring[self._r % _RING_SLOTS])
+            self._r += 1
             if utt is None:
                 continue
 
+            # тихая реплика (фон чуть выше порога VAD) — энкодер не запускаем
+            self._utt_total += 1
+            rms = float(np.sqrt(np.einsum("i,i->", utt, utt) / utt.size))
+            short = utt.size < self.vad.min_utt + self.frame
+            if rms < self.cfg.silence_gate or (short and rms < 1.5 * self.vad.th):
+                self._utt_silent += 1
+                continue
+
             if self.model is None:
                 self._emit_info("… (model loading)")
                 continue
 
-            y = whisper.pad_or_trim(utt.astype(np.float32))
+            assert utt.dtype == np.float32  # буфер VAD — float32, лишняя копия не нужна
+            if self.cfg.adaptive_length:
+                # окно — до целой секунды, а не фиксированные 30 с
+                target = min(whisper.audio.N_SAMPLES, -(-utt.size // self.sr) * self.sr)
+                y = whisper.pad_or_trim(utt, target)
+            else:
+                y = whisper.pad_or_trim(utt)
             if self.cfg.noise_reduction:
                 y = denoise_wiener(y)
+            # энкодер — один раз на реплику, дальше только декодер
+            feats = _embed_audio(self.model, y)
 
             mode = self.cfg.lang_mode
             if mode == "exclusive":
-                lang = self.cfg.chosen_lang if self.cfg.chosen_lang in self._allowed else "ru"
-                text = self._asr(y, lang)
+                lang = self.cfg.chosen_lang if self.cfg.chosen_lang in _ALLOWED_LANGS else "ru"
+                text = self._asr(feats, lang)
             elif mode == "priority":
-                primary = self.cfg.chosen_lang if self.cfg.chosen_lang in self._allowed else "ru"
-                text = self._asr(y, primary)
+                primary = self.cfg.chosen_lang if self.cfg.chosen_lang in _ALLOWED_LANGS else "ru"
+                text = self._asr(feats, primary)
                 if len(text.strip()) < 2:
-                    lang = self._best_lang(y, exclude={primary})
-                    text = self._asr(y, lang)
+                    lang = self._best_lang(feats, exclude={primary})
+                    text = self._asr(feats, lang)
                 else:
                     lang = primary
             else:
-                lang = self._best_lang(y)
+                lang = self._best_lang(feats)
                 if self._last_lang and lang != self._last_lang:
-                    lang2 = self._best_lang(y, force=True)
+                    lang2 = self._best_lang(feats, force=True)
                     lang = lang2
                 self._last_lang = lang
-                text = self._asr(y, lang)
+                text = self._asr(feats, lang)
 
             if text:
                 line = f"[{lang.upper()}] {text.strip()}"
@@ -297,44 +535,61 @@ class WhisperRecognizer:
                 self._emit_info(line)
 
     # --- helpers ---
-    def _best_lang(self, audio: np.ndarray, exclude: Optional[set] = None, force: bool = False) -> str:
-        mel = whisper.log_mel_spectrogram(audio)
-        _, probs = self.model.detect_language(mel)  # type: ignore[union-attr]
-        filt: Dict[str, float] = {k: float(v) for k, v in probs.items() if k in self._allowed}
-        if exclude:
-            for k in list(filt.keys()):
-                if k in exclude:
-                    filt.pop(k, None)
-        if not filt:
+    def _best_lang(self, feats: torch.Tensor, exclude: Optional[set] = None, force: bool = False) -> str:
+        with torch.inference_mode():
+            probs = _allowed_lang_probs(self.model, feats)  # type: ignore[arg-type]
+            if exclude:
+                for i, c in enumerate(_ALLOWED_LANGS):
+                    if c in exclude:
+                        probs[i] = -1.0
+            i = int(probs.argmax())
+            p = float(probs[i])
+        if p < 0.0:
             return self._last_lang or "en"
-        lang = max(filt, key=filt.get)
+        lang = _ALLOWED_LANGS[i]
         if not force and self._last_lang and lang != self._last_lang:
-            if filt.get(lang, 0.0) < 0.50:
+            if p < 0.50:
                 return self._last_lang
         return lang
 
-    def _asr(self, audio: np.ndarray, lang: str) -> str:
-        res = self.model.transcribe(  # type: ignore[union-attr]
-            audio,
-            language=lang,
+    def _asr(self, feats: torch.Tensor, lang: str) -> str:
+        beam = self.cfg.beam_size
+        opts = whisper.DecodingOptions(
             task="transcribe",
-            fp16=False,
+            language=lang,
             temperature=0.0,
-            best_of=5,
-            beam_size=5,
-            condition_on_previous_text=False,
-            no_speech_threshold=0.3,
+            beam_size=beam if beam > 1 else None,  # None → жадный декодер
+            without_timestamps=True,
+            fp16=False,
         )
-        return (res.get("text") or "").strip()
+        with torch.inference_mode():
+            res = _EncodedDecodingTask(self.model, opts).run(feats)[0]
+        # как в transcribe(): тишина, если no_speech высок и уверенность низкая
+        if res.no_speech_prob > _NO_SPEECH_TH and res.avg_logprob <= _LOGPROB_MIN:
+            return ""
+        bad = res.compression_ratio > _COMPRESSION_MAX or res.avg_logprob < _LOGPROB_MIN
+        if bad and self.cfg.best_of > 1:
+            # один запасной проход сэмплированием вместо полной лестницы температур
+            opts = dataclasses.replace(opts, temperature=_FALLBACK_T, beam_size=None, best_of=self.cfg.best_of)
+            with torch.inference_mode():
+                res = _EncodedDecodingTask(self.model, opts).run(feats)[0]
+        if res.compression_ratio > _COMPRESSION_MAX:
+            return ""  # зацикленная гипотеза
+        return (res.text or "").strip()
 
     def _resample_if_needed(self, x: np.ndarray, sr: int) -> np.ndarray:
         if sr == self.sr:
-            return x.astype(np.float32)
-        ratio = self.sr / float(sr)
-        n = int(len(x) * ratio)
-        idx = (np.arange(n) / ratio).astype(np.float32)
-        idx = np.clip(idx, 0, len(x) - 1)
-        return x[idx.astype(np.int32)].astype(np.float32)
+            return np.ascontiguousarray(x, dtype=np.float32)
+        fir = self._fir_cache.get(sr)
+        if fir is None:
+            up, down = Fraction(self.sr, sr).limit_denominator(1000).as_integer_ratio()
+            # тот же ФНЧ, что строит resample_poly по умолчанию (kaiser, beta=5)
+            max_rate = max(up, down)
+            h = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+            fir = self._fir_cache[sr] = (up, down, h)
+        up, down, h = fir
+        y = resample_poly(x.astype(np.float32, copy=False), up, down, window=h)
+        return y.astype(np.float32, copy=False)
 
     # --- emitters ---
     def _emit_text(self, s: str):
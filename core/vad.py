@@ -1,9 +1,28 @@
 # core/vad.py
 from __future__ import annotations
 import numpy as np
+from numba import njit
+
+from .audio import apply_gain_inplace
+
+# int16 PCM → [-1, 1]
+_INT16_SCALE = 1.0 / 32768.0
+
+
+@njit(cache=True, fastmath=True)
+def _abs_mean(a):
+    """Средний модуль за один проход, без временного массива."""
+    s = 0.0
+    for i in range(a.shape[0]):
+        s += abs(float(a[i]))  # через float: abs(-32768) в int16 переполняется
+    return s / a.shape[0]
+
 
 class EnergyVAD:
-    """Простой VAD по среднему модулю. Гистерезис + таймауты."""
+    """Простой VAD по среднему модулю. Гистерезис + таймауты.
+
+    Копит сырой int16 PCM; во float32 (с усилением gain) переводит только готовую реплику.
+    """
     def __init__(
         self,
         sr: int,
@@ -11,44 +30,61 @@ class EnergyVAD:
         min_utt_ms: int = 900,
         max_utt_ms: int = 6000,
         silence_ms: int = 450,
+        preroll_ms: int = 300,
+        gain: float = 1.0,
     ) -> None:
         self.sr = sr
         self.th = energy_thresh
+        self.gain = gain  # линейное усиление входа: учитывается в энергии и в реплике
         self.min_utt = int(sr * min_utt_ms / 1000.0)
         self.max_utt = int(sr * max_utt_ms / 1000.0)
         self.silence_need = int(sr * silence_ms / 1000.0)
+        # сколько тишины перед началом речи сохраняется в реплике
+        self.preroll = int(sr * preroll_ms / 1000.0)
+        # буфер фиксированного размера: max_utt + запас на 2 с (кадр не переполнит);
+        # выделяется один раз, reset() лишь сбрасывает индекс записи
+        self.buf = np.empty(self.max_utt + 2 * self.sr, dtype=np.int16)
         self.reset()
 
     def reset(self) -> None:
-        self.buf = np.zeros(0, dtype=np.float32)
+        self.write = 0
         self.silence_run = 0
         self.in_speech = False
 
     def feed(self, frame: np.ndarray):
-        """Принимает 1D float32, возвращает готовый utterance|None."""
+        """Принимает 1D int16, возвращает готовый utterance (float32)|None."""
         f = frame.reshape(-1)
-        self.buf = np.concatenate((self.buf, f))
-        energy = float(np.mean(np.abs(f)))
+        n = f.shape[0]
+        if not self.in_speech and self.write > self.preroll:
+            # до начала речи держим только короткий хвост тишины (pre-roll), а не весь буфер:
+            # иначе первая же фраза после долгой паузы сразу упирается в max_utt
+            self.buf[:self.preroll] = self.buf[self.write - self.preroll:self.write]
+            self.write = self.preroll
+        self.buf[self.write:self.write + n] = f
+        self.write += n
+        energy = _abs_mean(f) * (self.gain * _INT16_SCALE)
         voice = energy >= self.th
 
         if voice:
             self.in_speech = True
             self.silence_run = 0
         else:
-            self.silence_run += len(f)
+            self.silence_run += n
 
         # слишком длинно — отрежем
-        if self.in_speech and len(self.buf) >= self.max_utt:
-            utt = self.buf.copy()
-            self.reset()
-            return utt
+        if self.in_speech and self.write >= self.max_utt:
+            return self._take()
 
         # пауза завершила реплику
         if self.in_speech and self.silence_run >= self.silence_need:
-            if len(self.buf) >= self.min_utt:
-                utt = self.buf.copy()
-                self.reset()
-                return utt
+            if self.write >= self.min_utt:
+                return self._take()
             self.reset()
 
         return None
+
+    def _take(self) -> np.ndarray:
+        utt = self.buf[:self.write].astype(np.float32)
+        apply_gain_inplace(utt, self.gain * _INT16_SCALE)  # масштаб + усиление + ограничение
+        self.reset()
+        return utt
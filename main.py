@@ -1,5 +1,13 @@
 # main.py
-from ui.gui import run_gui
+import os
+
+# потоки BLAS/OpenMP — до любых импортов numpy/numba/torch (пулы создаются при загрузке библиотек)
+_CPU_THREADS = str(max(1, min(os.cpu_count() or 2, 4)))
+os.environ.setdefault("OMP_NUM_THREADS", _CPU_THREADS)
+os.environ.setdefault("MKL_NUM_THREADS", _CPU_THREADS)
+os.environ.setdefault("OPENBLAS_NUM_THREADS", _CPU_THREADS)
+
+from ui.gui import run_gui  # noqa: E402
 
 if __name__ == "__main__":
     run_gui()
@@ -3,27 +3,103 @@ from __future__ import annotations
 
 import os
 import sys
+import math
+import time
 import subprocess
-from typing import Optional
+from collections import deque
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 import numpy as np
 import sounddevice as sd
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-from core import WhisperRecognizer, ConfigManager, list_input_devices
-from ui.i18n import I18N, tr
+from core import ConfigManager, list_input_devices
+from ui.i18n import I18N, LocaleBinder, tr
+
+if TYPE_CHECKING:
+    from core import WhisperRecognizer
 
 
 class GuiBridge(QtCore.QObject):
     text_sig = QtCore.pyqtSignal(str)
     info_sig = QtCore.pyqtSignal(str)
     status_sig = QtCore.pyqtSignal(str)
+    ready_sig = QtCore.pyqtSignal(object)   # WhisperRecognizer, созданный в фоне
+    failed_sig = QtCore.pyqtSignal(str)     # ошибка импорта/создания распознавателя
+
+
+class MicTestWorker(QtCore.QThread):
+    """Тестовая запись микрофона в отдельном потоке: блокирующее чтение срезами по ~20 мс.
+
+    Никаких колбэков на аудио-потоке: уровень считается по уже записанному срезу
+    и отдаётся в GUI сигналом, готовый буфер — одним сигналом в конце.
+    """
+    level_sig = QtCore.pyqtSignal(int, float)   # (VU 0..100, dBFS)
+    done_sig = QtCore.pyqtSignal(object)        # np.ndarray float32
+    error_sig = QtCore.pyqtSignal(str)
+
+    SLICE_SEC = 0.02  # 320 кадров @16k: малый блок — низкая задержка и VU ~50 Гц
+
+    def __init__(self, dev_idx: Optional[int], sr: int, seconds: float, gain_lin: float, parent=None):
+        super().__init__(parent)
+        self.dev_idx = dev_idx
+        self.sr = int(sr)
+        self.frames = int(self.sr * seconds)
+        self.gain_lin = float(gain_lin)
+
+    def run(self):
+        buf = np.empty(self.frames, dtype=np.float32)
+        step = max(1, int(self.sr * self.SLICE_SEC))
+        n = 0
+        try:
+            with sd.InputStream(device=self.dev_idx, samplerate=self.sr, channels=1,
+                                dtype="float32", blocksize=step, latency="low") as stream:
+                while n < self.frames and not self.isInterruptionRequested():
+                    k = min(step, self.frames - n)
+                    data, _overflow = stream.read(k)
+                    # view на первый канал без копии; единственная копия — в буфер записи (с приведением к float32)
+                    raw = data[:, 0] if data.ndim == 2 else data
+                    x = buf[n:n + k]
+                    if not raw.any():
+                        # нулевой блок (mute/пауза): без усиления и RMS
+                        x.fill(0.0)
+                        n += k
+                        self.level_sig.emit(0, -180.0)
+                        continue
+                    np.copyto(x, raw, casting="unsafe")
+                    if self.gain_lin > 1.0:
+                        np.multiply(x, self.gain_lin, out=x)
+                        np.clip(x, -1.0, 1.0, out=x)
+                    elif self.gain_lin != 1.0:
+                        # ослабление не выводит за [-1, 1] — clip не нужен
+                        np.multiply(x, self.gain_lin, out=x)
+                    n += k
+                    rms = math.sqrt(float(np.dot(x, x)) / k) + 1e-9
+                    db = 20.0 * math.log10(rms)
+                    vu = max(0.0, min(100.0, (db + 60.0) * (100.0 / 60.0)))
+                    self.level_sig.emit(int(vu), db)
+        except Exception as e:
+            if not self.isInterruptionRequested():
+                self.error_sig.emit(str(e))
+            return
+        # прерванный тест (диалог закрыт) — результат никому не нужен
+        if not self.isInterruptionRequested():
+            self.done_sig.emit(buf[:n])
 
 
 class SettingsDialog(QtWidgets.QDialog):
     TEST_SECONDS = 2.0
-
-    def __init__(self, parent, cfg: ConfigManager, recognizer: WhisperRecognizer, on_apply):
+    TEST_SILENCE_DBFS = -50.0  # пик ниже — запись считаем тишиной, язык не определяем
+
+    def __init__(
+        self,
+        parent,
+        cfg: ConfigManager,
+        recognizer: WhisperRecognizer,
+        on_apply,
+        devices: Optional[List[dict]] = None,
+        refresh_devices: Optional[Callable[[], List[dict]]] = None,
+    ):
         super().__init__(parent)
         self.cfg = cfg
         self.recognizer = recognizer
@@ -40,17 +116,17 @@ class SettingsDialog(QtWidgets.QDialog):
         box = QtWidgets.QGroupBox(tr("settings.group.mic"))
         gl = QtWidgets.QGridLayout(box)
 
-        self.devices = list_input_devices()
+        # список устройств кэширует MainWindow — опрос PortAudio/WASAPI небыстрый
+        self._refresh_devices = refresh_devices or list_input_devices
+        self.devices = devices if devices is not None else self._refresh_devices()
         self.dev_combo = QtWidgets.QComboBox()
-        names = [f"[{d['index']}] {d['name']}  (ch={d['channels']}, sr={int(d['sr'])})" for d in self.devices]
-        self.dev_combo.addItems(names)
-        cur_idx = self.cfg.device_index
-        if cur_idx is not None:
-            i = next((k for k, dv in enumerate(self.devices) if dv["index"] == cur_idx), -1)
-            if i >= 0:
-                self.dev_combo.setCurrentIndex(i)
+        self._fill_devices(self.cfg.device_index)
         gl.addWidget(QtWidgets.QLabel(tr("settings.device")), 0, 0)
-        gl.addWidget(self.dev_combo, 0, 1, 1, 2)
+        gl.addWidget(self.dev_combo, 0, 1)
+
+        self.dev_refresh_btn = QtWidgets.QPushButton(tr("settings.device.refresh"))
+        self.dev_refresh_btn.clicked.connect(self._on_refresh_devices)
+        gl.addWidget(self.dev_refresh_btn, 0, 2)
 
         self.gain_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
         self.gain_slider.setRange(-200, 200)
@@ -72,9 +148,10 @@ class SettingsDialog(QtWidgets.QDialog):
         ml = QtWidgets.QGridLayout(mbox)
 
         self.model_combo = QtWidgets.QComboBox()
-        self.model_combo.addItems(["small", "medium", "large"])
         cur_model = self.cfg.model_name if self.cfg.model_name in {"small", "medium", "large"} else "small"
-        self.model_combo.setCurrentIndex({"small": 0, "medium": 1, "large": 2}[cur_model])
+        with QtCore.QSignalBlocker(self.model_combo):
+            self.model_combo.addItems(["small", "medium", "large"])
+            self.model_combo.setCurrentIndex({"small": 0, "medium": 1, "large": 2}[cur_model])
         self.model_combo.setToolTip(tr("settings.model.tip"))
         ml.addWidget(QtWidgets.QLabel(tr("settings.model.size")), 0, 0)
         ml.addWidget(self.model_combo, 0, 1)
@@ -85,21 +162,24 @@ class SettingsDialog(QtWidgets.QDialog):
         lbox = QtWidgets.QGroupBox(tr("settings.group.lang"))
         ll = QtWidgets.QGridLayout(lbox)
 
+        # комбобоксы заполняем с заблокированными сигналами; видимость языка — один раз в конце
         self.mode_combo = QtWidgets.QComboBox()
-        self.mode_combo.addItems([
-            tr("settings.mode.standard"),
-            tr("settings.mode.priority"),
-            tr("settings.mode.exclusive"),
-        ])
         m_idx = {"standard": 0, "priority": 1, "exclusive": 2}.get(self.cfg.lang_mode, 0)
-        self.mode_combo.setCurrentIndex(m_idx)
+        with QtCore.QSignalBlocker(self.mode_combo):
+            self.mode_combo.addItems([
+                tr("settings.mode.standard"),
+                tr("settings.mode.priority"),
+                tr("settings.mode.exclusive"),
+            ])
+            self.mode_combo.setCurrentIndex(m_idx)
         ll.addWidget(QtWidgets.QLabel(tr("settings.mode")), 0, 0)
         ll.addWidget(self.mode_combo, 0, 1, 1, 2)
 
         self.lang_combo = QtWidgets.QComboBox()
-        self.lang_combo.addItems(["ru", "en", "zh"])
         lang = self.cfg.chosen_lang if self.cfg.chosen_lang in {"ru", "en", "zh"} else "ru"
-        self.lang_combo.setCurrentIndex({"ru": 0, "en": 1, "zh": 2}[lang])
+        with QtCore.QSignalBlocker(self.lang_combo):
+            self.lang_combo.addItems(["ru", "en", "zh"])
+            self.lang_combo.setCurrentIndex({"ru": 0, "en": 1, "zh": 2}[lang])
         ll.addWidget(QtWidgets.QLabel(tr("settings.chosen_lang")), 1, 0)
         ll.addWidget(self.lang_combo, 1, 1)
 
@@ -112,9 +192,10 @@ class SettingsDialog(QtWidgets.QDialog):
         ul = QtWidgets.QGridLayout(uibox)
         self.ui_lang_combo = QtWidgets.QComboBox()
         # показываем самоназвания
-        self.ui_lang_combo.addItems(["Русский (ru)", "English (en)", "中文 (zh)"])
         ui_map = {"ru": 0, "en": 1, "zh": 2}
-        self.ui_lang_combo.setCurrentIndex(ui_map.get(self.cfg.ui_language, 0))
+        with QtCore.QSignalBlocker(self.ui_lang_combo):
+            self.ui_lang_combo.addItems(["Русский (ru)", "English (en)", "中文 (zh)"])
+            self.ui_lang_combo.setCurrentIndex(ui_map.get(self.cfg.ui_language, 0))
         ul.addWidget(QtWidgets.QLabel(tr("settings.ui_lang")), 0, 0)
         ul.addWidget(self.ui_lang_combo, 0, 1)
         root.addWidget(uibox)
@@ -160,12 +241,30 @@ class SettingsDialog(QtWidgets.QDialog):
         root.addLayout(btns)
 
         # состояния теста
-        self._test_stream: Optional[sd.InputStream] = None
+        self._test_worker: Optional[MicTestWorker] = None
         self._test_running = False
-        self._test_buf: list[np.ndarray] = []
         self._test_sr = int(self.cfg.sample_rate)
         self._last_test_audio: Optional[np.ndarray] = None
 
+    def _fill_devices(self, cur_idx: Optional[int]):
+        # позиция в комбобоксе по индексу устройства — O(1) вместо перебора
+        self._dev_pos = {int(d["index"]): k for k, d in enumerate(self.devices)}
+        with QtCore.QSignalBlocker(self.dev_combo):
+            self.dev_combo.clear()
+            self.dev_combo.addItems([d["_display"] for d in self.devices])
+            if cur_idx is not None:
+                i = self._dev_pos.get(int(cur_idx), -1)
+                if i >= 0:
+                    self.dev_combo.setCurrentIndex(i)
+
+    def _on_refresh_devices(self):
+        cur = None
+        i = self.dev_combo.currentIndex()
+        if 0 <= i < len(self.devices):
+            cur = int(self.devices[i]["index"])
+        self.devices = self._refresh_devices()
+        self._fill_devices(cur)
+
     def _update_lang_visibility(self):
         need = (self.mode_combo.currentIndex() in (1, 2))
         self.lang_combo.setEnabled(need)
@@ -198,7 +297,6 @@ class SettingsDialog(QtWidgets.QDialog):
         self.test_btn.setEnabled(False)
         self.play_btn.setEnabled(False)
         self.lang_label.setText(tr("settings.lang.detected"))
-        self._test_buf.clear()
         self._last_test_audio = None
 
         dev_idx = None
@@ -206,66 +304,70 @@ class SettingsDialog(QtWidgets.QDialog):
         if 0 <= i < len(self.devices):
             dev_idx = int(self.devices[i]["index"])
 
-        frames_to_read = int(self._test_sr * self.TEST_SECONDS)
-        collected = {"n": 0}
         gain_lin = 10.0 ** ((self.gain_slider.value() / 10.0) / 20.0)
+        w = MicTestWorker(dev_idx, self._test_sr, self.TEST_SECONDS, gain_lin, self)
+        w.level_sig.connect(self._set_vu)
+        w.done_sig.connect(self._stop_test)
+        w.error_sig.connect(self._on_test_error)
+        w.finished.connect(w.deleteLater)
+        self._test_worker = w
+        w.start()
+
+    @QtCore.pyqtSlot(int, float)
+    def _set_vu(self, vu: int, db: float):
+        self.vu.setValue(vu)
+        self.db_label.setText(f"{db:.1f} dBFS")
 
-        def _cb(indata, frames, time_info, status):
-            x = indata.reshape(-1).astype(np.float32)
-            if gain_lin != 1.0:
-                x = np.clip(x * gain_lin, -1.0, 1.0)
-            rms = float(np.sqrt(np.mean(x * x)) + 1e-9)
-            db = 20.0 * np.log10(rms)
-            vu = max(0.0, min(100.0, (db + 60.0) * (100.0 / 60.0)))
-            QtCore.QMetaObject.invokeMethod(self.vu, "setValue", QtCore.Qt.QueuedConnection, QtCore.Q_ARG(int, int(vu)))
-            self.db_label.setText(f"{db:.1f} dBFS")
-
-            self._test_buf.append(x.copy())
-            collected["n"] += frames
-            if collected["n"] >= frames_to_read:
-                QtCore.QTimer.singleShot(0, self._stop_test)
-
-        try:
-            self._test_stream = sd.InputStream(
-                device=dev_idx, samplerate=self._test_sr, channels=1,
-                dtype="float32", blocksize=int(self._test_sr * 0.2), callback=_cb
-            )
-            self._test_stream.start()
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, tr("settings.title"), tr("settings.test.err").format(e))
-            self._test_running = False
-            self.test_btn.setEnabled(True)
-            self.play_btn.setEnabled(False)
+    @QtCore.pyqtSlot(str)
+    def _on_test_error(self, msg: str):
+        self._test_worker = None
+        self._test_running = False
+        self.test_btn.setEnabled(True)
+        self.play_btn.setEnabled(False)
+        QtWidgets.QMessageBox.critical(self, tr("settings.title"), tr("settings.test.err").format(msg))
 
-    def _stop_test(self):
-        if self._test_stream is not None:
-            try:
-                self._test_stream.stop()
-                self._test_stream.close()
-            except Exception:
-                pass
-        self._test_stream = None
+    @QtCore.pyqtSlot(object)
+    def _stop_test(self, audio: np.ndarray):
+        self._test_worker = None
         self._test_running = False
         self.test_btn.setEnabled(True)
 
         try:
-            if not self._test_buf:
+            if audio is None or len(audio) == 0:
                 self.lang_label.setText(tr("settings.lang.detected"))
                 self.play_btn.setEnabled(False)
                 return
 
-            audio = np.concatenate(self._test_buf).astype(np.float32)
             self._last_test_audio = audio
             self.play_btn.setEnabled(True)
 
+            peak = float(np.max(np.abs(audio)))
+            if 20.0 * math.log10(peak + 1e-9) < self.TEST_SILENCE_DBFS:
+                self.lang_label.setText(tr("settings.lang.detected"))
+                return
+
             lang, conf = self.recognizer.detect_language_from_audio(audio, self._test_sr)
             label = {"ru": "RU", "en": "EN", "zh": "ZH"}.get(lang, lang.upper())
             self.lang_label.setText(f"{tr('settings.lang.detected')[:-1]} {label} ({conf:.2f})")
         except Exception:
             self.lang_label.setText(tr("settings.lang.detected"))
             self.play_btn.setEnabled(False)
-        finally:
-            self._test_buf.clear()
+
+    def done(self, r: int):
+        # закрытие диалога во время теста: дождаться остановки записи
+        # и отключить сигналы, чтобы уже поставленные в очередь не дошли до закрытого диалога
+        w = self._test_worker
+        if w is not None:
+            for sig in (w.level_sig, w.done_sig, w.error_sig):
+                try:
+                    sig.disconnect()
+                except TypeError:
+                    pass
+            w.requestInterruption()
+            w.wait()
+            self._test_worker = None
+            self._test_running = False
+        super().done(r)
 
     def _play_test(self):
         if self._last_test_audio is None or len(self._last_test_audio) == 0:
@@ -279,57 +381,91 @@ class SettingsDialog(QtWidgets.QDialog):
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    MAX_LOG_LINES = 5000  # строк в окне вывода
+    APPEND_COALESCE_MS = 50
+
+    # готовые стили индикатора и кнопки паузы по статусу
+    _DOT_QSS = {
+        "idle": "color:#9E9E9E; font-size:14pt;",
+        "loading": "color:#FBC02D; font-size:14pt;",
+        "running": "color:#2E7D32; font-size:14pt;",
+        "paused": "color:#FBC02D; font-size:14pt;",
+        "stopped": "color:#C62828; font-size:14pt;",
+    }
+    _BTN_QSS = {
+        "running": "background:#C62828; color:white; font-weight:bold;",
+        "paused": "background:#1565C0; color:white; font-weight:bold;",
+        "stopped": "background:#C62828; color:white; font-weight:bold;",
+    }
+    DEVICES_TTL = 300.0  # сек; по кнопке «Обновить» в настройках — сразу
+
     def __init__(self):
         super().__init__()
         self.cfg = ConfigManager()
         I18N.set_lang(self.cfg.ui_language)
 
-        self.setWindowTitle(tr("app.title"))
+        # устройства ввода: перечисляем один раз и переиспользуем между открытиями настроек
+        self._cached_devices: List[dict] = []
+        self._devices_ts = 0.0
+        self._refresh_devices()
+
+        # статичные подписи окна — через реестр, чтобы смена языка была одним проходом
+        self._locale = LocaleBinder()
+        self._locale.bind(self.setWindowTitle, "app.title")
         self.resize(980, 740)
 
         central = QtWidgets.QWidget(); self.setCentralWidget(central)
         vbox = QtWidgets.QVBoxLayout(central)
 
         # Заголовок
-        self.title_lbl = QtWidgets.QLabel(tr("main.header"))
+        self.title_lbl = QtWidgets.QLabel()
+        self._locale.bind(self.title_lbl.setText, "main.header")
         f = self.title_lbl.font(); f.setPointSize(13); f.setBold(True); self.title_lbl.setFont(f)
         vbox.addWidget(self.title_lbl)
 
         # Строка режима/языка
         info_row = QtWidgets.QHBoxLayout(); info_row.setSpacing(12)
-        self.mode_text_lbl = QtWidgets.QLabel(tr("main.mode"))
+        self.mode_text_lbl = QtWidgets.QLabel(); self._locale.bind(self.mode_text_lbl.setText, "main.mode")
         self.mode_value_lbl = QtWidgets.QLabel("—"); self.mode_value_lbl.setStyleSheet("font-weight:bold;")
-        self.lang_text_lbl = QtWidgets.QLabel(tr("main.lang"))
+        self._locale.bind(self.mode_value_lbl.setToolTip, "tip.mode")
+        self.lang_text_lbl = QtWidgets.QLabel(); self._locale.bind(self.lang_text_lbl.setText, "main.lang")
         self.lang_value_lbl = QtWidgets.QLabel("—"); self.lang_value_lbl.setStyleSheet("font-weight:bold;")
+        self._locale.bind(self.lang_value_lbl.setToolTip, "tip.lang")
         info_row.addWidget(self.mode_text_lbl); info_row.addWidget(self.mode_value_lbl)
         info_row.addWidget(self.lang_text_lbl); info_row.addWidget(self.lang_value_lbl); info_row.addStretch(1)
         vbox.addLayout(info_row)
 
         # Вывод
         self.out = QtWidgets.QPlainTextEdit(); self.out.setReadOnly(True)
+        self.out.setMaximumBlockCount(self.MAX_LOG_LINES)  # старые строки уходят сами (FIFO)
+        self._pending: deque = deque()
+        self._drain_scheduled = False
         self.out.setStyleSheet("background:#121212; color:#E6E6E6; font-family:Consolas; font-size:11pt;")
         vbox.addWidget(self.out, 1)
 
         # Кнопки
         bar = QtWidgets.QHBoxLayout(); vbox.addLayout(bar)
-        self.btn_start = QtWidgets.QPushButton(tr("main.btn.start"))
+        self.btn_start = QtWidgets.QPushButton(); self._locale.bind(self.btn_start.setText, "main.btn.start")
         self.btn_start.setStyleSheet("background:#2E7D32; color:white; font-weight:bold;")
         self.btn_start.clicked.connect(self.on_start); bar.addWidget(self.btn_start)
 
         self.btn_toggle = QtWidgets.QPushButton(tr("main.btn.stop_stream"))
-        self.btn_toggle.setStyleSheet("background:#C62828; color:white; font-weight:bold;")
+        self._btn_qss = self._BTN_QSS["stopped"]
+        self.btn_toggle.setStyleSheet(self._btn_qss)
         self.btn_toggle.setEnabled(False); self.btn_toggle.clicked.connect(self.on_toggle); bar.addWidget(self.btn_toggle)
 
-        self.btn_openlog = QtWidgets.QPushButton(tr("main.btn.open_log"))
+        self.btn_openlog = QtWidgets.QPushButton(); self._locale.bind(self.btn_openlog.setText, "main.btn.open_log")
         self.btn_openlog.setEnabled(False); self.btn_openlog.clicked.connect(self.on_open_log); bar.addWidget(self.btn_openlog)
 
-        self.btn_settings = QtWidgets.QPushButton(tr("main.btn.settings"))
+        self.btn_settings = QtWidgets.QPushButton(); self._locale.bind(self.btn_settings.setText, "main.btn.settings")
         self.btn_settings.clicked.connect(self.on_settings); bar.addWidget(self.btn_settings)
 
-        self.btn_exit = QtWidgets.QPushButton(tr("main.btn.exit"))
+        self.btn_exit = QtWidgets.QPushButton(); self._locale.bind(self.btn_exit.setText, "main.btn.exit")
         self.btn_exit.clicked.connect(self.on_exit); bar.addWidget(self.btn_exit)
 
-        self.status_dot = QtWidgets.QLabel("●"); self.status_dot.setStyleSheet("color:#9E9E9E; font-size:14pt;")
+        self._last_status = "idle"
+        self._dot_qss = self._DOT_QSS["idle"]
+        self.status_dot = QtWidgets.QLabel("●"); self.status_dot.setStyleSheet(self._dot_qss)
         self.statusBar().addPermanentWidget(self.status_dot)
         self.statusBar().showMessage(tr("status.ready"))
 
@@ -339,18 +475,68 @@ class MainWindow(QtWidgets.QMainWindow):
         self.bridge.info_sig.connect(self._append)
         self.bridge.status_sig.connect(self._set_status)
 
-        # распознаватель
-        self.recognizer = WhisperRecognizer(
-            on_text=lambda s: self.bridge.text_sig.emit(s),
-            on_info=lambda s: self.bridge.info_sig.emit(s),
-            on_status=lambda s: self.bridge.status_sig.emit(s),
-            config=self.cfg
-        )
+        # распознаватель создаём в фоне (импорт torch/whisper), окно показывается сразу
+        self.recognizer: Optional[WhisperRecognizer] = None
+        self.btn_start.setEnabled(False)
+        self._init_error: Optional[str] = None
+        self.bridge.ready_sig.connect(self._on_recognizer_ready)
+        self.bridge.failed_sig.connect(self._on_recognizer_failed)
+        QtCore.QThreadPool.globalInstance().start(self._create_recognizer)
 
-        self._append(f"[i] Log: {self.recognizer.log_path}")
-        self._append(self._format_cfg_line())
         self._refresh_mode_lang_strip()
 
+    def _create_recognizer(self):
+        # выполняется в пуле потоков: здесь только создание, всё остальное — в GUI через сигнал
+        try:
+            from core import WhisperRecognizer
+            rec = WhisperRecognizer(
+                on_text=lambda s: self.bridge.text_sig.emit(s),
+                on_info=lambda s: self.bridge.info_sig.emit(s),
+                on_status=lambda s: self.bridge.status_sig.emit(s),
+                config=self.cfg
+            )
+        except Exception as e:
+            self.bridge.failed_sig.emit(f"{type(e).__name__}: {e}")
+            return
+        self.bridge.ready_sig.emit(rec)
+
+    @QtCore.pyqtSlot(object)
+    def _on_recognizer_ready(self, rec):
+        self.recognizer = rec
+        self.btn_start.setEnabled(True)
+        self._append(f"[i] Log: {rec.log_path}")
+        self._append(self._format_cfg_line())
+
+    @QtCore.pyqtSlot(str)
+    def _on_recognizer_failed(self, err: str):
+        # распознавателя не будет: окно в состоянии ошибки, а не вечной «загрузки»
+        self._init_error = err
+        self._append(f"[ERROR] Recognizer init: {err}")
+        self.btn_start.setEnabled(False); self.btn_toggle.setEnabled(False)
+        self._dot_qss = self._DOT_QSS["stopped"]
+        self.status_dot.setStyleSheet(self._dot_qss)
+        self.statusBar().showMessage(tr("status.init_failed"))
+        QtWidgets.QMessageBox.critical(self, tr("app.title"), tr("main.msg.init_failed").format(err))
+
+    def _recognizer_ready(self) -> bool:
+        if self.recognizer is None:
+            if self._init_error is not None:
+                QtWidgets.QMessageBox.critical(self, tr("app.title"), tr("main.msg.init_failed").format(self._init_error))
+            else:
+                QtWidgets.QMessageBox.information(self, tr("app.title"), tr("main.msg.loading"))
+            return False
+        return True
+
+    def _refresh_devices(self) -> List[dict]:
+        self._cached_devices = list_input_devices()
+        self._devices_ts = time.monotonic()
+        return self._cached_devices
+
+    def _devices(self) -> List[dict]:
+        if time.monotonic() - self._devices_ts > self.DEVICES_TTL:
+            return self._refresh_devices()
+        return self._cached_devices
+
     def _format_cfg_line(self) -> str:
         di = self.cfg.device_index
         return (f"[cfg] device_index={di if di is not None else 'default'}, "
@@ -372,49 +558,72 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.mode_value_lbl.setText(mode_txt)
         self.lang_value_lbl.setText(lang_txt)
-        self.mode_value_lbl.setToolTip(tr("tip.mode"))
-        self.lang_value_lbl.setToolTip(tr("tip.lang"))
 
     @QtCore.pyqtSlot(str)
     def _append(self, text: str):
+        # строки копятся и выводятся пачкой раз в APPEND_COALESCE_MS — одна правка документа вместо N
+        self._pending.append(text)
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            QtCore.QTimer.singleShot(self.APPEND_COALESCE_MS, self._drain_pending)
+
+    def _drain_pending(self):
+        self._drain_scheduled = False
+        if not self._pending:
+            return
+        text = "\n".join(self._pending)
+        self._pending.clear()
+        # автопрокрутка только если пользователь уже внизу — не дёргаем скролл при чтении истории
+        sb = self.out.verticalScrollBar()
+        at_bottom = sb.value() >= sb.maximum() - 4
         self.out.appendPlainText(text)
-        self.out.verticalScrollBar().setValue(self.out.verticalScrollBar().maximum())
+        if at_bottom:
+            sb.setValue(sb.maximum())
 
     @QtCore.pyqtSlot(str)
     def _set_status(self, status: str):
-        if status == "loading":
-            self.status_dot.setStyleSheet("color:#FBC02D; font-size:14pt;")
+        key = status if status in ("loading", "running", "paused") else "stopped"
+        if key == "loading":
             self.statusBar().showMessage(tr("status.loading"))
             self.btn_start.setEnabled(False); self.btn_toggle.setEnabled(False)
-        elif status == "running":
-            self.status_dot.setStyleSheet("color:#2E7D32; font-size:14pt;")
+        elif key == "running":
             self.statusBar().showMessage(tr("status.listening"))
             self.btn_toggle.setEnabled(True)
             self.btn_toggle.setText(tr("main.btn.stop_stream"))
-            self.btn_toggle.setStyleSheet("background:#C62828; color:white; font-weight:bold;")
             self.btn_openlog.setEnabled(True); self.btn_start.setEnabled(False)
-        elif status == "paused":
-            self.status_dot.setStyleSheet("color:#FBC02D; font-size:14pt;")
+        elif key == "paused":
             self.statusBar().showMessage(tr("status.paused"))
             self.btn_toggle.setEnabled(True)
             self.btn_toggle.setText(tr("main.btn.resume_stream"))
-            self.btn_toggle.setStyleSheet("background:#1565C0; color:white; font-weight:bold;")
             self.btn_openlog.setEnabled(True)
         else:
-            self.status_dot.setStyleSheet("color:#C62828; font-size:14pt;")
             self.statusBar().showMessage(tr("status.stopped"))
             self.btn_toggle.setEnabled(False)
             self.btn_toggle.setText(tr("main.btn.stop_stream"))
-            self.btn_toggle.setStyleSheet("background:#C62828; color:white; font-weight:bold;")
             self.btn_start.setEnabled(True)
+        # стили — только при реальной смене (каждый setStyleSheet заново разбирает QSS)
+        if key != self._last_status:
+            self._last_status = key
+            dot = self._DOT_QSS[key]
+            if dot != self._dot_qss:
+                self._dot_qss = dot
+                self.status_dot.setStyleSheet(dot)
+            btn = self._BTN_QSS.get(key)
+            if btn is not None and btn != self._btn_qss:
+                self._btn_qss = btn
+                self.btn_toggle.setStyleSheet(btn)
 
     # кнопки
     def on_start(self):
+        if not self._recognizer_ready():
+            return
         self._append("🧠 Start recognition…")
         self.btn_start.setEnabled(False); self.btn_toggle.setEnabled(False)
         QtCore.QTimer.singleShot(0, self.recognizer.start)
 
     def on_toggle(self):
+        if not self._recognizer_ready():
+            return
         if not self.recognizer.is_running:
             QtWidgets.QMessageBox.information(self, tr("app.title"), tr("main.msg.not_started"))
             return
@@ -424,6 +633,8 @@ class MainWindow(QtWidgets.QMainWindow):
             self.recognizer.pause()
 
     def on_open_log(self):
+        if not self._recognizer_ready():
+            return
         path = str(self.recognizer.log_path)
         try:
             if sys.platform.startswith("win"):
@@ -436,10 +647,13 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.critical(self, tr("app.title"), tr("main.msg.openlog.error").format(e))
 
     def on_settings(self):
+        if not self._recognizer_ready():
+            return
+
         def _apply(new_dev, new_gain, new_nr, mode, chosen, model_name, ui_lang):
-            # применяем к распознавателю и конфигу
-            self.recognizer.apply_new_settings(new_dev, new_gain, new_nr, mode, chosen, model_name)
+            # применяем к распознавателю и конфигу (apply_new_settings пишет config.json один раз)
             self.cfg.ui_language = ui_lang
+            self.recognizer.apply_new_settings(new_dev, new_gain, new_nr, mode, chosen, model_name)
             I18N.set_lang(ui_lang)
 
             # обновляем тексты UI
@@ -452,26 +666,25 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.recognizer.stop()
                 QtCore.QTimer.singleShot(350, self.recognizer.start)
 
-        dlg = SettingsDialog(self, self.cfg, self.recognizer, _apply)
+        dlg = SettingsDialog(
+            self, self.cfg, self.recognizer, _apply,
+            devices=self._devices(), refresh_devices=self._refresh_devices,
+        )
         dlg.exec_()
 
     def _apply_locale(self):
-        # заголовки/подписи/кнопки/статусы
-        self.setWindowTitle(tr("app.title"))
-        self.title_lbl.setText(tr("main.header"))
-        self.mode_text_lbl.setText(tr("main.mode"))
-        self.lang_text_lbl.setText(tr("main.lang"))
-        self.btn_start.setText(tr("main.btn.start"))
+        # заголовки/подписи/кнопки/подсказки — одним проходом по реестру
+        self._locale.retranslate()
         # состояние кнопки паузы меняем по статусу
-        if self.recognizer.is_running and not self.recognizer.is_paused:
+        rec = self.recognizer
+        if rec is None:
+            self.btn_toggle.setText(tr("main.btn.stop_stream"))
+        elif rec.is_running and not rec.is_paused:
             self.btn_toggle.setText(tr("main.btn.stop_stream"))
-        elif self.recognizer.is_paused:
+        elif rec.is_paused:
             self.btn_toggle.setText(tr("main.btn.resume_stream"))
         else:
             self.btn_toggle.setText(tr("main.btn.stop_stream"))
-        self.btn_openlog.setText(tr("main.btn.open_log"))
-        self.btn_settings.setText(tr("main.btn.settings"))
-        self.btn_exit.setText(tr("main.btn.exit"))
         # статусбар (не трогаем, если уже что-то показывает)
         if not self.statusBar().currentMessage():
             self.statusBar().showMessage(tr("status.ready"))
@@ -480,7 +693,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def on_exit(self):
         try:
-            self.recognizer.stop()
+            if self.recognizer is not None:
+                self.recognizer.stop()
         finally:
             self.close()
 
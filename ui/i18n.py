@@ -1,10 +1,12 @@
 # ui/i18n.py
 from __future__ import annotations
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping
 
 class I18N:
     _lang = "ru"
 
+    # исходная таблица {ключ: {язык: строка}}; после сборки _BY_LANG удаляется
     _STRINGS: Dict[str, Dict[str, str]] = {
         # ==== Общие ====
         "app.title": {
@@ -37,6 +39,17 @@ class I18N:
             "en": "Stream is not started yet.",
             "zh": "音频流尚未启动。",
         },
+        "main.msg.loading": {
+            "ru": "Распознаватель ещё загружается, подождите…",
+            "en": "Recognizer is still loading, please wait…",
+            "zh": "识别器仍在加载，请稍候…",
+        },
+        "main.msg.init_failed": {
+            "ru": "Не удалось инициализировать распознаватель:\n{}",
+            "en": "Failed to initialize the recognizer:\n{}",
+            "zh": "无法初始化识别器：\n{}",
+        },
+        "status.init_failed": {"ru": "Ошибка инициализации", "en": "Initialization failed", "zh": "初始化失败"},
         "main.msg.openlog.error": {
             "ru": "Не удалось открыть лог-файл:\n{}",
             "en": "Failed to open log file:\n{}",
@@ -74,6 +87,7 @@ class I18N:
         "settings.title": {"ru": "⚙ Настройки", "en": "⚙ Settings", "zh": "⚙ 设置"},
         "settings.group.mic": {"ru": "Микрофон и вход", "en": "Microphone & Input", "zh": "麦克风与输入"},
         "settings.device": {"ru": "Устройство ввода:", "en": "Input device:", "zh": "输入设备："},
+        "settings.device.refresh": {"ru": "⟳ Обновить", "en": "⟳ Refresh", "zh": "⟳ 刷新"},
         "settings.gain": {"ru": "Усиление (дБ):", "en": "Gain (dB):", "zh": "增益（dB）："},
         "settings.nr": {"ru": "Включить шумоподавление (Wiener)", "en": "Enable noise reduction (Wiener)", "zh": "启用降噪（Wiener）"},
 
@@ -110,17 +124,55 @@ class I18N:
         "settings.play.no": {"ru": "Нет записанного фрагмента. Сначала выполните тест.", "en": "No recorded sample. Run the test first.", "zh": "没有录到片段，请先进行测试。"},
     }
 
+    # плоские неизменяемые словари {ключ: строка} на каждый язык (с откатом на en) — собираются один раз
+    _BY_LANG: Dict[str, Mapping[str, str]] = {}
+
     @classmethod
     def set_lang(cls, lang: str) -> None:
+        global _current
         if lang not in ("ru", "en", "zh"):
             lang = "ru"
         cls._lang = lang
+        _current = cls._BY_LANG[lang]
+        # tr импортируют по имени (from ui.i18n import tr) — меняем его default, а не саму функцию
+        tr.__defaults__ = (_current.get,)
 
     @classmethod
     def t(cls, key: str) -> str:
-        m = cls._STRINGS.get(key, {})
-        return m.get(cls._lang, m.get("en", key))
+        return cls._BY_LANG[cls._lang].get(key, key)
+
+
+I18N._BY_LANG = {
+    lang: MappingProxyType({k: v.get(lang, v.get("en", k)) for k, v in I18N._STRINGS.items()})
+    for lang in ("ru", "en", "zh")
+}
+del I18N._STRINGS  # вложенная таблица больше не нужна
+
+# словарь текущего языка; переключается только в I18N.set_lang()
+_current: Mapping[str, str] = I18N._BY_LANG[I18N._lang]
+
+# Удобный псевдоним: один вызов .get словаря текущего языка (связан через default-аргумент)
+def tr(key: str, _get: Callable[[str, str], str] = _current.get) -> str:
+    return _get(key, key)
+
+
+class LocaleBinder:
+    """Реестр (сеттер, ключ): перевод всех привязанных подписей одним проходом.
+
+    Сеттер вызывается только если строка для текущего языка изменилась.
+    """
+
+    def __init__(self) -> None:
+        self._items: List[List[Any]] = []  # [setter, key, last_text]
+
+    def bind(self, setter: Callable[[str], Any], key: str) -> None:
+        text = tr(key)
+        setter(text)
+        self._items.append([setter, key, text])
 
-# Удобный псевдоним
-def tr(key: str) -> str:
-    return I18N.t(key)
+    def retranslate(self) -> None:
+        for item in self._items:
+            text = tr(item[1])
+            if text != item[2]:
+                item[0](text)
+                item[2] = text